@@ -1,29 +1,21 @@
 """Make sure that the version number has been increased and does not exist on PyPI yet."""
 
 import importlib.metadata
-import subprocess
+import urllib.error
+import urllib.request
 
 pysweepme_version = importlib.metadata.version("pysweepme")
 
-not_found = False
-
+# PyPI answers with 404 for versions that have not been published, so the response body does not need to be parsed
 try:
-    subprocess.check_call(
-        [  # noqa: S603, S607
-            "python",
-            "-m",
-            "pip",
-            "install",
-            "--no-deps",
-            "--ignore-installed",
-            "--dry-run",
-            f"pysweepme=={pysweepme_version}",
-        ],
-    )
-except subprocess.SubprocessError:
-    not_found = True
+    with urllib.request.urlopen(f"https://pypi.org/pypi/pysweepme/{pysweepme_version}/json", timeout=10):  # noqa: S310
+        published = True
+except urllib.error.HTTPError as e:
+    if e.code != 404:  # noqa: PLR2004
+        raise
+    published = False
 
-if not_found is False:
+if published:
     exc_msg = (
         f"Version {pysweepme_version} seems to be published already. "
         f"Did you forget to increase the version number in pysweepme/__init__.py?"
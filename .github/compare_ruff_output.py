@@ -1,64 +1,92 @@
 """Compare ruff output and complain when number of violations increases."""
 
+import hashlib
 import json
 import logging
+import mmap
+import pickle
+from collections import Counter
 from pathlib import Path
+from typing import Any, NamedTuple
 
-ParsedResult = dict[tuple[str, str], tuple[int, str]]
-Comparison = dict[tuple[str, str], tuple[int, int, str]]
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+class ParsedResult(NamedTuple):
+    """Number of violations and the rule message, both keyed by filename and rule code."""
+
+    counts: Counter[tuple[str, str]]
+    messages: dict[tuple[str, str], str]
+
+
+CACHE_FOLDER = Path(".tox") / "ruff_results_cache"
+# must be increased whenever ParsedResult changes, so outdated cache files are not used anymore
+CACHE_VERSION = 2
+# ruff reports absolute paths, so the reference folder is in the middle of the filenames and not a prefix
+REFERENCE_FOLDER = r"\.tox\reference"
 
 logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def load_json(buffer: mmap.mmap) -> Any:  # noqa: ANN401
+    """Parse json from a memory-mapped file instead of reading a copy of it."""
+    if orjson is None:
+        return json.loads(buffer[:])
+    with memoryview(buffer) as view:
+        return orjson.loads(view)
 
 
 def parse_results(filename: Path) -> ParsedResult:
-    """Read json and generate statistics."""
-    parsed_results: ParsedResult = {}
-    for violation in json.loads(filename.read_text()):
-        key = (violation["filename"].replace(r"\.tox\reference", ""), violation["code"])
-        count = parsed_results.get(key, (0, ""))[0] + 1
-        parsed_results[key] = (count, violation["message"])
+    """Read json and generate statistics.
+
+    The statistics are cached using the hash of the json file, so an unchanged file does not need to be parsed again.
+    """
+    with filename.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        cache_file = CACHE_FOLDER / f"{hashlib.sha256(buffer).hexdigest()}_v{CACHE_VERSION}.pkl"
+        if cache_file.is_file():
+            cached_results: ParsedResult = pickle.loads(cache_file.read_bytes())  # noqa: S301 - written by this script
+            return cached_results
+        violations = load_json(buffer)
+
+    parsed_results = ParsedResult(Counter(), {})
+    for violation in violations:
+        key = (violation["filename"].replace(REFERENCE_FOLDER, ""), violation["code"])
+        parsed_results.counts[key] += 1
+        parsed_results.messages.setdefault(key, violation["message"])
+
+    CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+    cache_file.write_bytes(pickle.dumps(parsed_results))
     return parsed_results
 
 
-def compare_results(*, result: ParsedResult, reference: ParsedResult) -> Comparison:
-    """Compare two ruff results and generate a report.
+def compare_results(*, result: ParsedResult, reference: ParsedResult) -> bool:
+    """Compare two ruff results and report regressions.
 
     Read two results from ruff, one from the actual code and one from the reference and compare them.
     If there is any violation on a per file and per rule basis where the number of violations increased,
-    this will be part of the return value.
-
+    it is logged as an error.
 
     Returns:
-        A dictionary mapping from the key which is a tuple of filename and rule code to a tuple consisting of
-        the reference violations, the actual violations, and the rule message.
+        True if the number of violations did not increase for any file and rule.
     """
-    comparison: Comparison = {}
-    for key, violation_details in result.items():
-        violations = violation_details[0]
-        reference_violations = reference.get(key, (0, ""))[0]
-        message = violation_details[1]
-        if violations > reference_violations:
-            comparison[key] = (reference_violations, violations, message)
-    return comparison
-
-
-def output_violations(comparison: Comparison) -> bool:
-    """Print output and return if everything is ok."""
-    for key, violation_details in comparison.items():
-        logging.error(
-            f"Violations increased from {violation_details[0]} to {violation_details[1]} "
-            f"for rule {key[1]} [{violation_details[2]}] in file '{key[0]}'.",
+    # subtracting Counters only keeps the keys where the number of violations increased
+    increased = result.counts - reference.counts
+    for filename, code in increased:
+        logger.error(
+            f"Violations increased from {reference.counts[filename, code]} to {result.counts[filename, code]} "
+            f"for rule {code} [{result.messages[filename, code]}] in file '{filename}'.",
         )
-    if len(comparison) > 0:
-        return False
-    return True
+    return len(increased) == 0
 
 
 result = parse_results(Path("ruff.json"))
 reference = parse_results(Path("ref.json"))
 
-comparison = compare_results(result=result, reference=reference)
-if output_violations(comparison) is False:
+if compare_results(result=result, reference=reference) is False:
     exc_msg = {"Code quality regression detected."}
     print(f"::error::{exc_msg}")  # noqa: T201
     raise ValueError(exc_msg)
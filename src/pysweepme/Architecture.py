@@ -1,53 +1,42 @@
 import sys
+from functools import cached_property
 from typing import List
 
 
 class VersionInfo:
-    _information_extracted: bool = False
-    _python_version_str: str
-    _python_version_short_str: str
-    _python_bitness_str: str
-    _python_suffix: str
-    _python_compatibility_flags: List[str]
+    # the information does not change while python is running, so each property is only determined once
 
     def extract_information(self):
-        if not self._information_extracted:
-            version = sys.version_info
-            self._python_version_str = f"{version.major}.{version.minor}"
-            self._python_version_short_str = f"{version.major}{version.minor}"
-            self._python_bitness_str = "64" if sys.maxsize > 0x100000000 else "32"
-            self._python_suffix = f"{self._python_version_short_str}_{self._python_bitness_str}"
-            self._python_compatibility_flags = [
-                "any",
-                f"any-{self._python_bitness_str}",
-                f"{self._python_version_str}-any",
-                f"{self._python_version_str}-{self._python_bitness_str}",
-            ]
-            self._information_extracted = True
-
-    @property
+        """Determine all properties at once, which otherwise happens on their first access."""
+        for name in ("python_version_str", "python_bitness_str", "python_suffix", "python_compatibility_flags"):
+            getattr(self, name)
+
+    @cached_property
     def python_version_str(self) -> str:
-        if not self._information_extracted:
-            self.extract_information()
-        return self._python_version_str
+        version = sys.version_info
+        return f"{version.major}.{version.minor}"
+
+    @cached_property
+    def python_version_short_str(self) -> str:
+        version = sys.version_info
+        return f"{version.major}{version.minor}"
 
-    @property
+    @cached_property
     def python_bitness_str(self) -> str:
-        if not self._information_extracted:
-            self.extract_information()
-        return self._python_bitness_str
+        return "64" if sys.maxsize > 0x100000000 else "32"
 
-    @property
+    @cached_property
     def python_suffix(self) -> str:
-        if not self._information_extracted:
-            self.extract_information()
-        return self._python_suffix
+        return f"{self.python_version_short_str}_{self.python_bitness_str}"
 
-    @property
+    @cached_property
     def python_compatibility_flags(self) -> List[str]:
-        if not self._information_extracted:
-            self.extract_information()
-        return self._python_compatibility_flags
+        return [
+            "any",
+            f"any-{self.python_bitness_str}",
+            f"{self.python_version_str}-any",
+            f"{self.python_version_str}-{self.python_bitness_str}",
+        ]
 
 
 version_info = VersionInfo()
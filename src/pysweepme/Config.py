@@ -22,10 +22,18 @@
 
 from __future__ import annotations
 
+import contextlib
+import io
 import os
-from configparser import ConfigParser
+import shutil
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser, SectionProxy
+from operator import methodcaller
 from pathlib import Path
-from typing import Callable, cast
+from stat import S_ISREG
+from typing import Callable, ClassVar, cast
 
 from .ErrorMessage import error
 from .pysweepme_types import FileIOProtocol
@@ -84,6 +92,10 @@ class DefaultFileIO:
 class Config(ConfigParser):
     """Convenience wrapper around ConfigParser to quickly access config files."""
 
+    # Config instances are usually created for each access, so the parsed contents of the files are shared between all
+    # instances, together with the modification time and size of the file they belong to
+    _parse_cache: ClassVar[dict[str, tuple[tuple[int, int], dict[str, dict[str, str]]]]] = {}
+
     def __init__(
         self,
         file_name: Path | str,
@@ -113,24 +125,61 @@ class Config(ConfigParser):
 
         self.reader_writer = custom_reader_writer(file_name)
 
+        # modification time and size of the file when it was read last time, to only read it again when it changed
+        self._loaded_file_stat: tuple[int, int] | None = None
+        # whether the deprecated contents of an ini file given instead of a file name have been read already
+        self._contents_read = False
+
+    @classmethod
+    def bulk_load(cls, file_names: Iterable[Path | str]) -> list[Config]:
+        """Create Config instances for several files and load the files in parallel.
+
+        Args:
+            file_names: The paths to the config files.
+
+        Returns:
+            The Config instances in the order of the given file names, with their files loaded already.
+        """
+        configs = [cls(file_name) for file_name in file_names]
+
+        if not configs:
+            return configs
+
+        # loading mostly waits for the file system, so the files are read in parallel
+        with ThreadPoolExecutor(max_workers=min(len(configs), 32)) as executor:
+            list(executor.map(methodcaller("load_file"), configs))
+
+        return configs
+
     def setFileName(self, file_name):
         """Deprecated."""
         self.set_filename(file_name)
 
     def set_filename(self, file_name):
         self.file_name = file_name
+        self._loaded_file_stat = None
+        self._contents_read = False
 
     def isConfigFile(self):
         """Deprecated."""
         return self.is_file()
 
     def is_file(self):
-        try:
-            return bool(os.path.isfile(self.file_name))
-        except:
-            error()
+        # _stat_file already handles the errors of files that do not exist or names that cannot be a path
+        return self._stat_file() is not None
 
-        return False
+    def _stat_file(self) -> os.stat_result | None:
+        """Return the status of the config file with a single system call.
+
+        Returns:
+            The status of the file, or None if the file does not exist or is not a regular file.
+        """
+        try:
+            file_status = Path(self.file_name).stat()
+        except (OSError, ValueError):
+            # ValueError for strings that cannot be a path, e.g. the deprecated contents of an ini file
+            return None
+        return file_status if S_ISREG(file_status.st_mode) else None
 
     def readConfigFile(self):
         """Deprecated."""
@@ -138,24 +187,117 @@ class Config(ConfigParser):
 
     def load_file(self) -> bool:
         try:
-            if self.is_file():
-                with self.reader_writer.open("r", encoding="utf-8") as cf:
-                    self.read_file(cf)
+            file_status = self._stat_file()
+            if file_status is not None:
+                file_stat = (file_status.st_mtime_ns, file_status.st_size)
+                if file_stat != self._loaded_file_stat:
+                    cached = self._parse_cache.get(os.fspath(self.file_name))
+                    if cached is not None and cached[0] == file_stat:
+                        self._restore_snapshot(cached[1])
+                    else:
+                        # only the contents of the file itself can be shared, not the changes made by this instance
+                        is_empty = not self.sections() and not self.defaults()
+                        with self.reader_writer.open("r", encoding="utf-8") as cf:
+                            # reading and decoding the whole file at once is faster than reading it line by line
+                            self.read_string(cf.read(), source=str(self.file_name))
+                        if is_empty:
+                            self._parse_cache[os.fspath(self.file_name)] = (file_stat, self._snapshot())
                     if hasattr(self.reader_writer, "set_full_read"):
                         self.reader_writer.set_full_read()
+                    self._loaded_file_stat = file_stat
             elif isinstance(self.file_name, str):
                 # apparently the Config instance is not a valid, existing file, so we try to read it as the content
-                # of an ini file
-                self.read_string(self.file_name)
+                # of an ini file, which only needs to be parsed once as it cannot change
+                if not self._contents_read:
+                    self.read_string(self.file_name)
+                    self._contents_read = True
             else:
                 msg = f"The config file {self.file_name!s} does not exist and thus cannot be read."
                 ValueError(msg)
-        except:
+        # errors are reported instead of raised, but KeyboardInterrupt and SystemExit must still stop the program
+        except Exception:  # noqa: BLE001
             error()
             return False
 
         return True
 
+    def _snapshot(self) -> dict[str, dict[str, str]]:
+        """Copy the parsed sections including the default section.
+
+        Returns:
+            Dictionary of all sections with their options, including the default section.
+        """
+        snapshot = {section: dict(options) for section, options in self._sections.items()}  # type: ignore[attr-defined]
+        snapshot[self.default_section] = dict(self._defaults)  # type: ignore[attr-defined]
+        return snapshot
+
+    def _restore_snapshot(self, snapshot: dict[str, dict[str, str]]) -> None:
+        """Merge copied sections into this instance like reading the file would do.
+
+        The values are not checked again, e.g. for their interpolation syntax, as reading a file does not check them
+        either and they are only checked when they are requested.
+
+        Args:
+            snapshot: Dictionary of all sections with their options, including the default section.
+        """
+        for section, options in snapshot.items():
+            if section == self.default_section:
+                self._defaults.update(options)  # type: ignore[attr-defined]
+                continue
+            if section not in self._sections:  # type: ignore[attr-defined]
+                self._sections[section] = self._dict()  # type: ignore[attr-defined]
+                self._proxies[section] = SectionProxy(self, section)  # type: ignore[attr-defined]
+            self._sections[section].update(options)  # type: ignore[attr-defined]
+
+    def _write_file(self) -> None:
+        """Write all sections to the config file and remember the new state of the file.
+
+        The file contains exactly the contents of this instance afterwards, so it does not need to be read again.
+        """
+        contents = io.StringIO()
+        self.write(contents)
+
+        if isinstance(self.reader_writer, Path):
+            self._replace_file(contents.getvalue())
+        else:
+            # alternative reader writers registered by the application might check for external modifications when
+            # writing, so the file must be written via their open()
+            with self.reader_writer.open("w", encoding="utf-8") as cf:
+                cf.write(contents.getvalue())
+
+        file_status = self._stat_file()
+        if file_status is None:
+            self._loaded_file_stat = None
+            self._parse_cache.pop(os.fspath(self.file_name), None)
+        else:
+            self._loaded_file_stat = (file_status.st_mtime_ns, file_status.st_size)
+            self._parse_cache[os.fspath(self.file_name)] = (self._loaded_file_stat, self._snapshot())
+
+    def _replace_file(self, contents: str) -> None:
+        """Write the contents to a temporary file that replaces the config file afterwards.
+
+        That way, the config file is never left incomplete if the application is interrupted while writing.
+
+        Args:
+            contents: The new contents of the config file.
+        """
+        file = Path(self.file_name).resolve()
+        temporary_file = file.with_name(f"{file.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        try:
+            with temporary_file.open("w", encoding="utf-8") as cf:
+                cf.write(contents)
+                cf.flush()
+                os.fsync(cf.fileno())
+            with contextlib.suppress(FileNotFoundError):
+                shutil.copymode(file, temporary_file)
+            try:
+                temporary_file.replace(file)
+            except PermissionError:
+                # on Windows, a file cannot be replaced while another program has opened it
+                file.write_text(contents, encoding="utf-8")
+        finally:
+            temporary_file.unlink(missing_ok=True)
+
     def makeConfigFile(self):
         """Deprecated."""
         return self.create_file()
@@ -163,14 +305,12 @@ class Config(ConfigParser):
     def create_file(self):
         try:
             if not self.is_file():
-                if not os.path.exists(os.path.dirname(self.file_name)):
-                    os.mkdir(os.path.dirname(self.file_name))
+                Path(self.file_name).parent.mkdir(parents=True, exist_ok=True)
 
-                with self.reader_writer.open("w", encoding="utf-8") as cf:
-                    self.write(cf)
+                self._write_file()
 
                 return True
-        except:
+        except Exception:  # noqa: BLE001
             error()
 
         return False
@@ -184,9 +324,8 @@ class Config(ConfigParser):
             if self.load_file():
                 if not self.has_section(section):
                     self.add_section(section)
-                with self.reader_writer.open("w", encoding="utf-8") as cf:
-                    self.write(cf)
-        except:
+                self._write_file()
+        except Exception:  # noqa: BLE001
             error()
             return False
 
@@ -198,11 +337,12 @@ class Config(ConfigParser):
 
     def set_option(self, section: str, option: str, value: str) -> bool:
         try:
-            self.set_section(section)
+            # the section is added without writing the file, so that it is written only once together with the option
+            if self.load_file() and not self.has_section(section):
+                self.add_section(section)
             self.set(section, option, value)
-            with self.reader_writer.open("w", encoding="utf-8") as cf:
-                self.write(cf)
-        except:
+            self._write_file()
+        except Exception:  # noqa: BLE001
             error()
             return False
 
@@ -212,10 +352,9 @@ class Config(ConfigParser):
         try:
             if self.load_file() and self.has_section(section) and self.has_option(section, option):
                 self.remove_option(section, option)
-                with self.reader_writer.open("w", encoding="utf-8") as cf:
-                    self.write(cf)
+                self._write_file()
                 return True
-        except:
+        except Exception:  # noqa: BLE001
             error()
 
         return False
@@ -236,10 +375,13 @@ class Config(ConfigParser):
 
     def get_value(self, section, option):
         if self.load_file() and section in self:
-            if option.lower() in self[section]:
-                return self[section][option.lower()]
-            elif option in self[section]:
-                return self[section][option]
+            options = self[section]
+            lower_option = option.lower()
+            if lower_option in options:
+                return options[lower_option]
+            # the original key only needs to be checked if it differs from the lower case key
+            if option != lower_option and option in options:
+                return options[option]
         return False
 
     def getConfigOptions(self, section):
@@ -247,15 +389,17 @@ class Config(ConfigParser):
         return self.get_options(section)
 
     def get_options(self, section):
-        vals = {}
         if self.load_file() and section in self:
-            for key in self[section]:
-                vals[key] = self[section][key]
-        return vals
+            # items() resolves the defaults once for the section instead of looking up each key via a proxy
+            return dict(self.items(section))
+        return {}
 
     def getConfig(self):
         """Deprecated."""
         return self.get_values()
 
     def get_values(self):
-        return {section: self.getConfigOptions(section) for section in self.getConfigSections()}
+        # the file is loaded once for all sections instead of once for each section
+        if not self.load_file():
+            return {}
+        return {section: dict(self.items(section)) for section in self.sections()}
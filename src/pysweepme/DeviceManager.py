@@ -21,9 +21,13 @@
 # SOFTWARE.
 
 
-import imp
+from __future__ import annotations
+
+import importlib.util
 import os
+import sys
 import types
+import weakref
 from pathlib import Path
 
 from ._utils import deprecated
@@ -32,6 +36,15 @@ from .EmptyDeviceClass import EmptyDevice
 from .ErrorMessage import error
 from .PortManager import PortManager
 
+# name of the main file matching the running python version and bitness, which does not change while python is running
+_main_py_file_name = f"main_{version_info.python_suffix}.py"
+
+# loaded driver modules with the modification time of their main file, so that they are only loaded again if changed
+_driver_modules: dict[str, tuple[int, types.ModuleType]] = {}
+
+# driver instances returned by get_driver(), which can be reused as long as they are referenced somewhere else
+_driver_instances: weakref.WeakValueDictionary[tuple[str, str, str], EmptyDevice] = weakref.WeakValueDictionary()
+
 
 def get_main_py_path(path: str) -> str:
     """Find the main python file matching the current architecture best.
@@ -45,12 +58,40 @@ def get_main_py_path(path: str) -> str:
     Returns:
         The path to the main<suffix>.py file.
     """
-    test_file = path + os.sep + f"main_{version_info.python_suffix}.py"
+    test_file = path + os.sep + _main_py_file_name
     if Path(test_file).is_file():
         return test_file
     return path + os.sep + "main.py"
 
 
+def load_source(name: str, path: str) -> types.ModuleType:
+    """Load a python file as module, as the deprecated load_source function of the imp module did.
+
+    The module is registered in sys.modules under the given name, and the compiled bytecode is cached in __pycache__.
+
+    Args:
+        name: The name of the module.
+        path: The path to the python file.
+
+    Returns:
+        The loaded module.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        msg = f"Cannot create a module from file {path}."
+        raise ImportError(msg)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+
+    return module
+
+
 def get_driver_module(folder: str, name: str) -> types.ModuleType:
     """Load the module containing the requested driver.
 
@@ -66,8 +107,23 @@ def get_driver_module(folder: str, name: str) -> types.ModuleType:
     name = name.strip(r"\/")
 
     try:
-        # Loads .py file as module
-        module = imp.load_source(name, get_main_py_path(folder + os.sep + name))
+        main_py_path = get_main_py_path(folder + os.sep + name)
+        try:
+            modification_time: int | None = Path(main_py_path).stat().st_mtime_ns
+        except OSError:
+            # the file cannot be cached, loading it will report the error
+            modification_time = None
+
+        cached = _driver_modules.get(main_py_path)
+        if cached is not None and modification_time is not None and cached[0] == modification_time:
+            module = cached[1]
+            # like loading the file, the module is registered with the name of the driver
+            sys.modules[name] = module
+        else:
+            # Loads .py file as module
+            module = load_source(name, main_py_path)
+            if modification_time is not None:
+                _driver_modules[main_py_path] = (modification_time, module)
     except Exception as e:  # noqa: BLE001
         # We don't know what could go wrong, so we catch all exceptions, log the error, and raise an Exception again
         error()
@@ -79,6 +135,11 @@ def get_driver_module(folder: str, name: str) -> types.ModuleType:
     return module
 
 
+def clear_driver_cache() -> None:
+    """Forget all loaded driver modules, so that they are loaded again when requested the next time."""
+    _driver_modules.clear()
+
+
 def get_driver_class(folder: str, name: str) -> type[EmptyDevice]:
     """Get the class (not an instance) of the requested driver.
 
@@ -133,7 +194,7 @@ def setup_driver(driver: EmptyDevice, name: str, port_string: str) -> None:
         driver.set_parameters({"Device": name})
 
 
-def get_driver(name: str, folder: str = ".", port_string: str = "") -> EmptyDevice:
+def get_driver(name: str, folder: str = ".", port_string: str = "", reuse: bool = False) -> EmptyDevice:
     """Create a driver instance.
 
     When the driver uses the port manager, the port will already be opened, but the connect() function of
@@ -145,14 +206,23 @@ def get_driver(name: str, folder: str = ".", port_string: str = "") -> EmptyDevi
             from the folder of the running script/project
         port_string: (optional) A port resource name as selected in SweepMe! such as 'COM1', 'GPIB0::1::INSTR', etc.
             It is required if the driver connects to an instrument and needs to open a specific port.
+        reuse: (optional) If True, a driver instance that was created before for the same name, folder, and port and
+            that is still in use is returned instead of creating a new instance and opening the port again.
 
     Returns:
         Initialized Device object of the driver with port and default parameters set.
     """
     name = name.strip(r"\/")
 
+    key = (folder, name, port_string)
+    if reuse:
+        existing_driver = _driver_instances.get(key)
+        if existing_driver is not None:
+            return existing_driver
+
     driver = get_driver_instance(folder, name)
     setup_driver(driver, name, port_string)
+    _driver_instances[key] = driver
 
     return driver
 
@@ -23,10 +23,14 @@
 from __future__ import annotations
 
 import os
-from time import localtime
-from traceback import print_exc
+import sys
+from time import strftime
+from traceback import TracebackException
 from typing import Callable
 
+_TIMESTAMP_FORMAT = "%d.%m.%Y %H:%M:%S"
+_SEPARATOR = "-" * 60 + "\n"
+
 
 def try_to_print_traceback() -> None:
     """Print a traceback for the most recent python exception.
@@ -36,8 +40,23 @@ def try_to_print_traceback() -> None:
     the function tries to monkey patch the traceback module to skip reading lines
     from the file and still try to print as many error details as possible.
     """
+    sys.stdout.write(_try_to_format_traceback())
+
+
+def _try_to_format_traceback() -> str:
+    """Format the most recent python exception the same way print_exc() prints it.
+
+    The source lines of the frames are only looked up while formatting, and the traceback is returned as a single
+    string so that it can be written with one call. If reading the source lines fails with a UnicodeDecodeError,
+    the lines of the affected files are skipped.
+
+    Returns:
+        The formatted traceback.
+    """
+    # the exception is retrieved before formatting, as a failed attempt would replace it with the UnicodeDecodeError
+    exc_info = sys.exc_info()
     try:
-        print_exc()
+        return "".join(TracebackException(*exc_info, lookup_lines=False).format())
     except UnicodeDecodeError:
         import traceback
 
@@ -57,7 +76,7 @@ def try_to_print_traceback() -> None:
                 return []
 
         traceback.linecache.updatecache = try_updatecache  # type: ignore[attr-defined]
-        print_exc()
+        return "".join(TracebackException(*exc_info, lookup_lines=False).format())
 
 
 def error(*args: object) -> None:
@@ -66,14 +85,14 @@ def error(*args: object) -> None:
     Args:
         *args: The arguments to print to the debug log.
     """
-    year, month, day, hour, min, sec = localtime()[:6]
-    print("-" * 60)
-    print("Time: %s.%s.%s %02d:%02d:%02d" % (day, month, year, hour, min, sec))
+    header = _SEPARATOR
+    header += f"Time: {strftime(_TIMESTAMP_FORMAT)}\n"
     if len(args) > 0:
-        print("Message:", *args)
-    print("Python Error:")
-    try_to_print_traceback()
-    print("-" * 60)
+        header += " ".join(["Message:", *map(str, args)]) + "\n"
+    header += "Python Error:\n"
+
+    # write the whole block at once to keep it together when several threads report errors at the same time
+    sys.stdout.write(header + _try_to_format_traceback() + _SEPARATOR)
 
 
 def debug(*args: object, debugmode_only: bool = False) -> None:
@@ -83,12 +102,14 @@ def debug(*args: object, debugmode_only: bool = False) -> None:
         *args: The arguments to print to the debug log.
         debugmode_only: True if the arguments shall be printed only when debug mode is on.
     """
-    debug_mode = os.environ["SWEEPME_DEBUGMODE"] == "True" if "SWEEPME_DEBUGMODE" in os.environ else False
+    if len(args) == 0:
+        return
+
+    # the debug mode is only looked up for messages that depend on it
+    if debugmode_only and os.environ.get("SWEEPME_DEBUGMODE") != "True":
+        return
 
-    if (not debugmode_only or debug_mode) and len(args) > 0:
-        year, month, day, hour, min, sec = localtime()[:6]
-        print("-" * 60)
-        print("Debug: %s.%s.%s %02d:%02d:%02d\t" % (day, month, year, hour, min, sec), *args)
+    sys.stdout.write(_SEPARATOR + " ".join([f"Debug: {strftime(_TIMESTAMP_FORMAT)}\t", *map(str, args)]) + "\n")
 
 
 def debug_only(*args: object) -> None:
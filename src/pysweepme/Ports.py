@@ -21,10 +21,16 @@
 # SOFTWARE.
 from __future__ import annotations
 
+import functools
 import re
 import socket
+import sys
+import threading
 import time
-from typing import Tuple, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import methodcaller
+from typing import Any, ClassVar, Tuple, Union
 
 import psutil
 
@@ -36,12 +42,12 @@ try:
     import serial
     import serial.rs485
     import serial.tools.list_ports
-except:
+except ImportError:
     pass
 
 try:
     import pyvisa
-except:
+except ImportError:
     pass
 
 
@@ -58,10 +64,18 @@ def get_porttypes():
 def get_resources(keys):
     """ returns all resource strings for the given list of port type string """
 
-    resources = []
+    resources: list[str] = []
 
-    for key in keys:
-        resources += port_types[key].find_resources()
+    if not keys:
+        return resources
+
+    # finding resources mostly waits for the operating system or the VISA runtime, so all port types are searched
+    # in parallel and the resources are returned in the order of the given keys
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        found_resources = list(executor.map(methodcaller("find_resources"), [port_types[key] for key in keys]))
+
+    for port_type_resources in found_resources:
+        resources += port_type_resources
 
     return resources
 
@@ -71,6 +85,10 @@ def open_resourcemanager(visafile_path=""):
 
     rm = None
 
+    # without pyvisa, there is no need to probe any visa dll
+    if "pyvisa" not in sys.modules:
+        return rm
+
     if visafile_path == "":
 
         possible_visa_paths = [
@@ -84,18 +102,27 @@ def open_resourcemanager(visafile_path=""):
             "C:\\Program Files (x86)\\IVI Foundation\\VISA\\WinNT\\RsVisa\\bin\\visa32.dll",
         ]
 
+        # each failing attempt is slow as VISA searches for its dll and drivers,
+        # so the path that worked last time is tried first
+        last_working_visa_path = _visa_paths.get("last_working")
+        if last_working_visa_path is not None:
+            possible_visa_paths.remove(last_working_visa_path)
+            possible_visa_paths.insert(0, last_working_visa_path)
+
         for visa_path in possible_visa_paths:
 
             try:
                 rm = pyvisa.ResourceManager(visa_path)
+                _visa_paths["last_working"] = visa_path
                 break
-            except:
+            # OSError if the dll cannot be loaded, ValueError if no VISA implementation can be found at all
+            except (OSError, ValueError, pyvisa.errors.Error):
                 continue
 
     else:
         try:
             rm = pyvisa.ResourceManager(visafile_path)
-        except:
+        except (OSError, ValueError, pyvisa.errors.Error):
             error("Creating resource manager from visa dll file '%s' failed." % visafile_path)
 
     return rm
@@ -104,6 +131,8 @@ def open_resourcemanager(visafile_path=""):
 def close_resourcemanager():
     """ closes the current resource manager instance """
 
+    clear_visa_resources_cache()
+
     try:
         # print("close resource manager", rm.session)
         if rm is not None:
@@ -122,17 +151,17 @@ def get_resourcemanager():
 
     global rm
 
+    # without VISA runtime, no resource manager could be created, which is checked without raising an exception
+    if rm is None:
+        return False
+
     try:
         rm.session  # if object exists the resource manager is open
 
     except pyvisa.errors.InvalidSession:
         rm = open_resourcemanager()
-
-    except AttributeError:  # if rm is not defined
-        return False
-
-    except:
-        return False
+        if rm is None:
+            return False
 
     # print("get resource manager", rm.session)
     # print("get visalib", rm.visalib)
@@ -140,6 +169,38 @@ def get_resourcemanager():
     return rm
 
 
+def list_visa_resources(prefix: str) -> list[str]:
+    """Return all VISA resources whose resource name starts with the given prefix.
+
+    All VISA resources are queried at once and reused for a short time, so that finding the resources of several
+    port types only requires a single, potentially slow, query of the VISA runtime.
+
+    Args:
+        prefix: The beginning of the resource names, e.g. "GPIB" or "USB".
+
+    Returns:
+        List of resource names.
+    """
+    # port types can be searched in parallel, but only the first of them shall query the VISA runtime
+    with _visa_resources_lock:
+        if (
+            _visa_resources_cache.time is None
+            or time.perf_counter() - _visa_resources_cache.time > VISA_RESOURCES_CACHE_DURATION
+        ):
+            if not get_resourcemanager():
+                return []
+            _visa_resources_cache.resources = tuple(rm.list_resources(VISA_RESOURCES_QUERY))
+            _visa_resources_cache.time = time.perf_counter()
+
+    return [resource for resource in _visa_resources_cache.resources if resource.startswith(prefix)]
+
+
+def clear_visa_resources_cache() -> None:
+    """Make sure that the VISA resources are queried again the next time they are requested."""
+    _visa_resources_cache.resources = ()
+    _visa_resources_cache.time = None
+
+
 def is_resourcemanager():
     """ check whether there is a resource manager instance """
 
@@ -149,6 +210,43 @@ def is_resourcemanager():
         return False
 
 
+def list_com_ports() -> list[str]:
+    """Return the names of all available COM ports.
+
+    On Windows, the COM ports are read from the registry where the serial port drivers register their ports. This is
+    much faster than serial.tools.list_ports, which additionally retrieves descriptions and hardware ids of each port.
+
+    Returns:
+        List of COM port names such as "COM1".
+    """
+    if sys.platform == "win32":
+        import winreg
+
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DEVICEMAP\SERIALCOMM") as key:
+                number_of_values = winreg.QueryInfoKey(key)[1]
+                return [str(winreg.EnumValue(key, index)[1]) for index in range(number_of_values)]
+        except OSError:
+            # the key does not exist if no COM port has ever been available
+            pass
+
+    return [str(port.device).split(" ")[0] for port in serial.tools.list_ports.comports()]
+
+
+@functools.cache
+def encode_terminator(terminator: str, encoding: str) -> bytes:
+    """Encode a terminator only once for each combination of terminator and encoding.
+
+    Args:
+        terminator: The terminator of the messages.
+        encoding: The encoding of the port.
+
+    Returns:
+        The encoded terminator.
+    """
+    return terminator.encode(encoding)
+
+
 def is_IP(port_str) -> Tuple[bool, str, int]:
     error_response = (False, "", -1)
     port_str = port_str.strip()
@@ -177,68 +275,28 @@ def get_port(ID, properties={}):
 
     port: Port
 
-    if ID.startswith("GPIB"):
-
-        try:
-            port = GPIBport(ID)
-        except:
-            error("Ports: Cannot create GPIB port object for %s" % ID)
-            return False
+    # the port type is given by the longest known prefix of the ID, e.g. 'GPIB' for 'GPIB0::1::INSTR'
     # TODO: Prologix can be removed here, if ID does not start with Prologix anymore
-    elif ID.startswith("PXI"):
-
-        try:
-            port = PXIport(ID)
-        except:
-            error("Ports: Cannot create PXI port object for %s" % ID)
-            return False
-
-    elif ID.startswith("ASRL"):
-
-        try:
-            port = ASRLport(ID)
-        except:
-            error("Ports: Cannot create ASRL port object for %s" % ID)
-            return False
-
-    elif ID.startswith("TCPIP"):
-
-        try:
-            port = TCPIPport(ID)
-        except:
-            error("Ports: Cannot create TCPIP port object for %s" % ID)
-            return False
+    prefix = next((prefix for prefix in _prefix_tuple if ID.startswith(prefix)), None)
+    port_type = port_classes[prefix] if prefix is not None else None
 
-    elif ID.startswith("COM"):
-
-        try:
-            port = COMport(ID)
-        except:
-            error("Ports: Cannot create COM port object for %s" % ID)
-            return False
-
-    elif ID.startswith("SOCKET") or is_IP(ID)[0]:
+    if port_type is None and is_IP(ID)[0]:
         # actually, the ID must not start with SOCKET, it only works for IPv4 addresses
-        try:
-            port = SOCKETport(ID)
-        except Exception:
-            error("Ports: Cannot create Socket port object for %s" % ID)
+        port_type = port_classes["SOCKET"]
 
-    elif ID.startswith("USB") or ID.startswith("USBTMC"):
-
-        try:
-            port = USBTMCport(ID)
-        except:
-            error("Ports: Cannot create USBTMC port object for %s" % ID)
-            return False
-
-    else:
+    if port_type is None:
         error("Ports: Cannot create port object for %s as port type is not defined." % ID)
         return False
 
-    # make sure the initial parameters are set
-    port.initialize_port_properties()
+    port_type_name, port_class = port_type
 
+    try:
+        port = port_class(ID)
+    except Exception:  # noqa: BLE001
+        error(f"Ports: Cannot create {port_type_name} port object for {ID}")
+        return False
+
+    # the initial parameters have already been set when creating the port object
     # here default properties are overwritten by specifications given in the DeviceClass
     # only overwrite by the DeviceClass which opens the port to allow to alter the properties further in open()
     port.port_properties.update(properties)
@@ -344,9 +402,7 @@ class COM(PortType):
             prologix_addresses.append(controller.get_address())
 
         try:
-            for ID in serial.tools.list_ports.comports():
-
-                id_str = str(ID.device).split(' ')[0]
+            for id_str in list_com_ports():
 
                 if id_str not in prologix_addresses:
                     resources.append(id_str)
@@ -364,6 +420,9 @@ class GPIB(PortType):
     properties.update({
         "GPIB_EOLwrite": None,
         "GPIB_EOLread": None,
+        # Prologix controllers only: read the answer automatically after each command, which saves one request per
+        # query, but should only be used if the instrument answers each command
+        "Prologix_auto_read": False,
     })
 
     def __init__(self):
@@ -378,14 +437,10 @@ class GPIB(PortType):
             resources += controller.list_resources()
 
         # get visa resources
-        if get_resourcemanager():
-
-            resources += rm.list_resources("GPIB?*")
+        resources += list_visa_resources("GPIB")
 
-            # one has to remove Interfaces such as ('GPIB0::INTFC',)
-            resources = [x for x in resources if "INTFC" not in x]
-
-        return resources
+        # one has to remove Interfaces such as ('GPIB0::INTFC',)
+        return [x for x in resources if "INTFC" not in x]
 
 
 class PXI(PortType):
@@ -399,17 +454,8 @@ class PXI(PortType):
 
     def find_resources_internal(self):
 
-        resources = []
-
-        # get visa resources
-        if get_resourcemanager():
-
-            resources += rm.list_resources("PXI?*")
-
-            # one has to remove Interfaces such as ('GPIB0::INTFC',)
-            resources = [x for x in resources if "INTFC" not in x]
-
-        return resources
+        # get visa resources, but one has to remove Interfaces such as ('GPIB0::INTFC',)
+        return [x for x in list_visa_resources("PXI") if "INTFC" not in x]
 
 
 class ASRL(PortType):
@@ -429,13 +475,7 @@ class ASRL(PortType):
 
     def find_resources_internal(self):
 
-        resources = []
-
-        if get_resourcemanager():
-
-            resources += rm.list_resources("ASRL?*")
-
-        return resources
+        return list_visa_resources("ASRL")
 
 
 class USBdevice(object):
@@ -462,13 +502,7 @@ class USBTMC(PortType):
 
     def find_resources_internal(self):
 
-        resources = []
-
-        if get_resourcemanager():
-
-            resources += rm.list_resources("USB?*")
-
-        return resources
+        return list_visa_resources("USB")
 
 
 class TCPIP(PortType):
@@ -484,13 +518,7 @@ class TCPIP(PortType):
 
     def find_resources_internal(self):
 
-        resources = []
-
-        if get_resourcemanager():
-
-            resources += list(rm.list_resources("TCPIP?*"))
-
-        return resources
+        return list_visa_resources("TCPIP")
 
 
 class SOCKET(PortType):
@@ -612,6 +640,39 @@ class Port(object):
     def write_internal(self, cmd):
         pass
 
+    def write_many(self, cmds: list[str]) -> None:
+        """Write several commands via a port.
+
+        Ports that support it send all commands at once, each followed by the write terminator, which saves the
+        overhead of a separate call for each command. In this case, the delay is only respected before the first
+        command and not between the commands.
+
+        Args:
+            cmds: The commands to write.
+        """
+        if self.port_properties["debug"]:
+            for cmd in cmds:
+                debug(" ".join([self.port_properties["ID"], "write:", repr(cmd)]))
+
+        cmds = [cmd for cmd in cmds if cmd != ""]
+        if cmds:
+            self.write_many_internal(cmds)
+
+    def write_many_internal(self, cmds: list[str]) -> None:
+        """Write the commands one after another, can be overwritten by ports that can write them at once."""
+        for cmd in cmds:
+            self.write_internal(cmd)
+
+    def _respect_delay(self) -> None:
+        """Wait until the delay since the last write has passed.
+
+        The remaining time is slept at once, as repeated short sleeps can take much longer than requested due to the
+        timer resolution of the operating system.
+        """
+        remaining = self.port_properties["delay"] - (time.perf_counter() - self.actualwritetime)
+        if remaining > 0:
+            time.sleep(remaining)
+
     def write_raw(self, cmd):
         """ write a command via a port without encoding"""
 
@@ -664,16 +725,23 @@ class GPIBport(Port):
 
         super().__init__(ID)
 
-    def open_internal(self):
+        # differentiate between visa GPIB and prologix_controller only once, as the ID does not change
+        # prologix IDs end with 'Prologix@' followed by the COM port of the controller
+        # for prologix controllers, the GPIB address is the second part of the ID and needed with each write and read
+        id_parts = ID.split("::")
+        if id_parts[-1].startswith("Prologix@"):
+            self.prologix_com_port = id_parts[-1][len("Prologix@"):]
+            self.prologix_gpib_address = id_parts[1]
+        else:
+            self.prologix_com_port = None
+            self.prologix_gpib_address = None
 
-        # differentiate between visa GPIB and prologix_controller
-        if "Prologix" in self.port_properties["ID"]:
-            # we take the last part of the ID and cutoff 'Prologix@' to get the COM port
-            com_port = self.port_properties["ID"].split("::")[-1][9:]
+    def open_internal(self):
 
+        if self.prologix_com_port is not None:
             # the prologix controller behaves like a port object
             # and has all function like open, close, clear, write, read
-            self.port = prologix_controller[com_port]
+            self.port = prologix_controller[self.prologix_com_port]
 
             # we give the prologix GPIB port the chance to setup
             self.port.open(self.port_properties)
@@ -709,11 +777,10 @@ class GPIBport(Port):
 
     def write_internal(self, cmd):
 
-        while time.perf_counter() - self.actualwritetime < self.port_properties["delay"]:
-            time.sleep(0.01)
+        self._respect_delay()
 
-        if "Prologix" in self.port_properties["ID"]:
-            self.port.write(cmd, self.port_properties["ID"].split("::")[1])
+        if self.prologix_gpib_address is not None:
+            self.port.write(cmd, self.prologix_gpib_address)
 
         else:
             self.port.write(cmd)
@@ -722,8 +789,8 @@ class GPIBport(Port):
 
     def read_internal(self, digits=0):
 
-        if "Prologix" in self.port_properties["ID"]:
-            answer = self.port.read(self.port_properties["ID"].split("::")[1])
+        if self.prologix_gpib_address is not None:
+            answer = self.port.read(self.prologix_gpib_address)
         else:
             if isinstance(self.port, PrologixGPIBcontroller):
                 raise TypeError("Prologix port resource found within non-prologix port object.")
@@ -762,8 +829,7 @@ class PXIport(Port):
 
     def write_internal(self, cmd):
 
-        while time.perf_counter() - self.actualwritetime < self.port_properties["delay"]:
-            time.sleep(0.01)
+        self._respect_delay()
 
         self.actualwritetime = time.perf_counter()
         exc_msg = ("Writing to PXIInstruments has not been implemented yet "
@@ -976,6 +1042,16 @@ class SOCKETport(Port):
 
         self.last_writetime = time.time()
 
+    def write_many_internal(self, cmds: list[str]) -> None:
+        """Send all commands with a single call."""
+        if time.time() - self.last_writetime < self.port_properties["delay"]:
+            time.sleep(self.port_properties["delay"] - (time.time() - self.last_writetime))
+
+        encoding = self.port_properties["encoding"]
+        self.port.sendall("".join(cmd + self.write_termination for cmd in cmds).encode(encoding))
+
+        self.last_writetime = time.time()
+
     def read_internal(self, digits=0):
 
         if digits == 0:
@@ -1002,15 +1078,73 @@ class SOCKETport(Port):
         return decoded_answer.rstrip(self.read_termination)
 
 
+if "serial" in sys.modules:
+
+    class BufferedSerial(serial.Serial):
+        """Serial port that keeps bytes which have been received after a line for the next reading.
+
+        COMport.readline() reads all waiting bytes at once and gives back the bytes after the terminator with unread().
+        They are returned first by read(), counted by in_waiting, and removed by reset_input_buffer() and close(), so
+        drivers that access the serial port directly via port.port see the same data as without buffering.
+        """
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            """Create the serial port with an empty buffer, all arguments are passed to pyserial."""
+            # the buffer must exist before pyserial opens the port, which happens if the port is given
+            self.read_buffer = bytearray()
+            super().__init__(*args, **kwargs)
+
+        def unread(self, data: bytes | bytearray) -> None:
+            """Put bytes back in front of the received bytes, so that they are returned by the next reading.
+
+            Args:
+                data: The bytes that have been read too far.
+            """
+            self.read_buffer[:0] = data
+
+        @property
+        def in_waiting(self) -> int:
+            """Return the number of bytes that can be read, including the bytes that have been put back."""
+            return len(self.read_buffer) + super().in_waiting
+
+        def read(self, size: int = 1) -> bytes:
+            """Read bytes, starting with the bytes that have been put back.
+
+            Args:
+                size: The number of bytes to read.
+
+            Returns:
+                The bytes read, which are less than requested in case of a timeout.
+            """
+            if not self.read_buffer:
+                return super().read(size)
+
+            answer = bytes(self.read_buffer[:size])
+            del self.read_buffer[:size]
+            if len(answer) < size:
+                answer += super().read(size - len(answer))
+            return answer
+
+        def reset_input_buffer(self) -> None:
+            """Discard the bytes that have been put back and all received bytes."""
+            self.read_buffer.clear()
+            super().reset_input_buffer()
+
+        def close(self) -> None:
+            """Close the port and discard the bytes that have been put back."""
+            self.read_buffer.clear()
+            super().close()
+
+
 class COMport(Port):
 
-    port: serial.Serial
+    port: BufferedSerial
 
     def __init__(self, ID):
 
         super().__init__(ID)
 
-        self.port = serial.Serial()
+        self.port = BufferedSerial()
 
     # def initialize_port_properties_internal(self):
 
@@ -1031,7 +1165,9 @@ class COMport(Port):
 
     def refresh_port(self):
 
-        self.port.port = str(self.port_properties["ID"])
+        # assigning the port name closes and reopens an open serial port, even if the name does not change
+        if self.port.port != str(self.port_properties["ID"]):
+            self.port.port = str(self.port_properties["ID"])
         self.port.timeout = float(self.port_properties["timeout"])
         self.port.baudrate = int(self.port_properties["baudrate"])
         self.port.bytesize = int(self.port_properties["bytesize"])
@@ -1045,13 +1181,11 @@ class COMport(Port):
 
     def open_internal(self):
 
+        # the settings of an already open serial port are applied immediately, so it does not need to be reopened
         self.refresh_port()
 
         if not self.port.is_open:
             self.port.open()
-        else:
-            self.port.close()
-            self.port.open()
 
     def close_internal(self):
         self.port.close()
@@ -1059,30 +1193,50 @@ class COMport(Port):
 
     def clear_internal(self) -> None:
         """Clear the port."""
+        if sys.platform == "win32" and self.port.is_open:
+            # purge both buffers with a single system call instead of one for each buffer
+            from serial import win32
+
+            # the handle is not part of the public pyserial API, so the buffers are reset as usual without it
+            port_handle: int | None = getattr(self.port, "_port_handle", None)
+            if port_handle is not None and win32.PurgeComm(
+                port_handle,
+                win32.PURGE_TXCLEAR | win32.PURGE_TXABORT | win32.PURGE_RXCLEAR | win32.PURGE_RXABORT,
+            ):
+                self.port.read_buffer.clear()
+                return
+
         self.port.reset_input_buffer()
         self.port.reset_output_buffer()
 
-    def write_internal(self, cmd):
-
-        while time.perf_counter() - self.actualwritetime < self.port_properties["delay"]:
-            time.sleep(0.01)
-
+    def encode_command(self, cmd: str | bytes) -> bytes:
+        """Return the bytes that are sent for a command, including the terminator."""
+        eol: str
         if self.port_properties["EOLwrite"] is not None:
             eol = self.port_properties["EOLwrite"]
         else:
             eol = self.port_properties["EOL"]
+        encoding: str = self.port_properties["encoding"]
 
-        if not self.port_properties["raw_write"]:
-            try:
-                cmd_bytes = (cmd + eol).encode(self.port_properties["encoding"])
-            except:
-                cmd_bytes = cmd + eol.encode(self.port_properties["encoding"])
+        if isinstance(cmd, str):
+            return (cmd + eol).encode(encoding)
 
-        else:
-            cmd_bytes = cmd + eol.encode(self.port_properties["encoding"])
-            # just send cmd as is without any eol/terminator because of raw_write
+        # bytes are sent as they are, e.g. because of raw_write, only followed by the encoded eol/terminator
+        return cmd + encode_terminator(eol, encoding)
+
+    def write_internal(self, cmd):
+
+        self._respect_delay()
+
+        self.port.write(self.encode_command(cmd))
 
-        self.port.write(cmd_bytes)
+        self.actualwritetime = time.perf_counter()
+
+    def write_many_internal(self, cmds: list[str]) -> None:
+        """Send all commands with a single call."""
+        self._respect_delay()
+
+        self.port.write(b"".join([self.encode_command(cmd) for cmd in cmds]))
 
         self.actualwritetime = time.perf_counter()
 
@@ -1092,14 +1246,7 @@ class COMport(Port):
             answer, EOLfound = self.readline()
 
             if not self.port_properties["raw_read"]:
-                try:
-                    answer = answer.decode(self.port_properties["encoding"])
-                except:
-                    error("Unable to decode the reading from %s. Please check whether the baudrate "
-                          "and the terminator are correct (Ports -> PortManager -> COM). "
-                          "You can get the raw reading by setting the key 'raw_read' of "
-                          "self.port_properties to True" % (self.port_properties["ID"]))
-                    raise
+                answer = self.decode_answer(answer)
 
         else:
             answer = self.port.read(digits)
@@ -1107,14 +1254,7 @@ class COMport(Port):
             EOLfound = True
 
             if not self.port_properties["raw_read"]:
-                try:
-                    answer = answer.decode(self.port_properties["encoding"])
-                except:
-                    error("Unable to decode the reading from %s. Please check whether the baudrate "
-                          "and the terminator are correct (Ports -> PortManager -> COM). "
-                          "You can get the raw reading by setting the key 'raw_read' of "
-                          "self.port_properties to True" % (self.port_properties["ID"]))
-                    raise
+                answer = self.decode_answer(answer)
 
         if answer == "" and not EOLfound and self.port_properties["Exception"] is True:
             self.close()
@@ -1124,6 +1264,18 @@ class COMport(Port):
 
         return answer
 
+    def decode_answer(self, answer: bytes) -> str:
+        """Decode a reading with the encoding of the port and report readings that cannot be decoded."""
+        try:
+            return answer.decode(self.port_properties["encoding"])
+        except UnicodeDecodeError:
+            error(
+                f"Unable to decode the reading from {self.port_properties['ID']}. Please check whether the baudrate "
+                "and the terminator are correct (Ports -> PortManager -> COM). "
+                "You can get the raw reading by setting the key 'raw_read' of self.port_properties to True",
+            )
+            raise
+
     def write_raw_internal(self, cmd):
 
         current = self.port_properties["raw_write"]
@@ -1147,27 +1299,32 @@ class COMport(Port):
         # this function allows to change the EOL, rewritten from pyserial
 
         if not self.port_properties["EOLread"] is None:
-            EOL = self.port_properties["EOLread"].encode(self.port_properties["encoding"])
+            EOL = encode_terminator(self.port_properties["EOLread"], self.port_properties["encoding"])
         else:
-            EOL = self.port_properties["EOL"].encode(self.port_properties["encoding"])
+            EOL = encode_terminator(self.port_properties["EOL"], self.port_properties["encoding"])
 
-        leneol = len(EOL)
         line = bytearray()
-
-        eol_found = False
+        search_start = 0
 
         while True:
-            c = self.port.read(1)
-            if c:
-                line += c
-                if line[-leneol:] == EOL:
-                    eol_found = True
-                    break
+            # all bytes that are already waiting are read at once, otherwise a single byte is awaited
+            # each read has its own timeout, so that slow devices can send long answers
+            c = self.port.read(self.port.in_waiting or 1)
+            if not c:
+                # timeout, the line is returned as received so far
+                return bytes(line), False
 
-            else:
-                break
+            line += c
+
+            eol_position = line.find(EOL, search_start) if EOL else -1
+            if eol_position >= 0:
+                # the bytes after the terminator are given back to the serial port for the next reading
+                self.port.unread(line[eol_position + len(EOL) :])
+                return bytes(line[:eol_position]), True
 
-        return bytes(line[:-leneol]), eol_found
+            # bytes that have been searched already only need to be searched again if they could be the beginning
+            # of the terminator
+            search_start = max(0, len(line) - len(EOL) + 1)
 
     def get_identification(self) -> str:
         """Get details of the COM port.
@@ -1193,6 +1350,14 @@ class COMport(Port):
 
 class PrologixGPIBcontroller:
 
+    # index of the EOS setting of the adapter for each terminator, the same for all controllers
+    terminator_character: ClassVar[dict[str, int]] = {
+        "\r\n": 0,
+        "\r": 1,
+        "\n": 2,
+        "": 3,
+    }
+
     def __init__(self, address):
 
         # basically the address could be used for COM ports but also for Ethernet
@@ -1201,19 +1366,16 @@ class PrologixGPIBcontroller:
 
         self._current_gpib_ID = None
 
+        # the values of the settings that have been sent to the controller, e.g. {"mode": "1"}, so that the settings
+        # are only sent again when opening further GPIB ports if they change
+        self._settings = {}
+
         self.ID_port_properties = {}
 
         self.port = serial.Serial()
         self.port.port = self.get_address()
         self.port.baudrate = 115200  # fixed, Prologix adapter automatically recognize the baudrate (tested with v6.0)
 
-        self.terminator_character = {
-            "\r\n": 0,
-            "\r": 1,
-            "\n": 2,
-            "": 3,
-        }
-
     def set_address(self, address):
         self._address = str(address)
 
@@ -1235,14 +1397,17 @@ class PrologixGPIBcontroller:
         if not self.port.is_open:
             self.port.open()
 
-        self.port.timeout = self.ID_port_properties[ID]["timeout"]
+            # the controller could have been reset in the meantime, so all settings have to be sent again
+            self._settings.clear()
+            self._current_gpib_ID = None
+
+            self.set_controller_in_charge()  # Controller in Charge CIC
+
         self.port.timeout = 0.1
 
         self.port.reset_input_buffer()
         self.port.reset_output_buffer()
 
-        self.set_controller_in_charge()  # Controller in Charge CIC
-
         self.set_mode(1)  # 1 = controller mode
 
         terminator = "\r\n"
@@ -1264,7 +1429,7 @@ class PrologixGPIBcontroller:
 
         self.set_eoi(1)  # 1 = eoi at end
 
-        self.set_auto(0)  # 0 =  no read-after-write
+        self.set_auto(int(bool(self.ID_port_properties[ID]["Prologix_auto_read"])))  # 1 = read-after-write
 
         self.set_read_timeout(0.05)  # read timeout in s
         # self.set_readtimeout(self.ID_port_properties[ID]["timeout"])  # read timeout in s
@@ -1300,15 +1465,21 @@ class PrologixGPIBcontroller:
                     # calls 'write' again, but as the command starts with '++' will not lead to an endless iteration
                     self.write("++addr %s" % self._current_gpib_ID)
 
-                # some special characters need to be escaped before sending
+                # the read-after-write setting of the controller is shared by all instruments, so it is changed when
+                # an instrument needs a different setting than the previous one
+                self.set_auto(int(bool(self.ID_port_properties[ID]["Prologix_auto_read"])))
+
+                msg = cmd.encode(self.ID_port_properties[ID]["encoding"])
+
+                # some special characters need to be escaped before sending, otherwise the controller removes them
                 # we start to replace ESC as it will be added by other commands as well
                 # and would be otherwise replaced again
-                cmd.replace(chr(27), chr(27) + chr(27))  # ESC (ASCII 27)
-                cmd.replace(chr(13), chr(27) + chr(13))  # CR  (ASCII 13)
-                cmd.replace(chr(10), chr(27) + chr(10))  # LF  (ASCII 10)
-                cmd.replace(chr(43), chr(27) + chr(43))  # ‘+’ (ASCII 43)
+                msg = msg.replace(b"\x1b", b"\x1b\x1b")  # ESC (ASCII 27)
+                msg = msg.replace(b"\r", b"\x1b\r")  # CR  (ASCII 13)
+                msg = msg.replace(b"\n", b"\x1b\n")  # LF  (ASCII 10)
+                msg = msg.replace(b"+", b"\x1b+")  # '+' (ASCII 43)
 
-                msg = (cmd + "\n").encode(self.ID_port_properties[ID]["encoding"])
+                msg += b"\n"
 
             # print("write:", msg)
             self.port.write(msg)
@@ -1321,51 +1492,89 @@ class PrologixGPIBcontroller:
 
         # print("in waiting:", self.port.in_waiting)
 
-        starttime = time.perf_counter()
+        # the read timeout of the controller is short, so that the answer is requested repeatedly until the
+        # timeout of the port is reached
+        deadline = time.perf_counter() + self.ID_port_properties[ID]["timeout"]
+
+        msg = bytearray()
 
-        msg = b""
+        # with read-after-write, the controller already requested the answer when the command was sent
+        request_answer = self._settings.get("auto") != "1"
 
-        while time.perf_counter() - starttime < self.ID_port_properties[ID]["timeout"]:
+        while time.perf_counter() < deadline:
 
-            self.write("++read eoi")  # requesting an answer
+            if request_answer:
+                self.write("++read eoi")  # requesting an answer
 
-            msg += self.port.readline()
+            line = self.port.readline()
+            msg += line
             # print("Prologix read message:", msg)
 
-            if b'\n' in msg:
+            # readline() only returns a line feed as last character, so the previous parts do not need to be searched
+            if line.endswith(b"\n"):
                 break
 
+            # the controller gives up reading after its short read timeout, also with read-after-write, so the rest
+            # of the answer of a slow instrument has to be requested
+            request_answer = True
+
         if self.ID_port_properties[ID]["rstrip"]:
             msg = msg.rstrip()
 
         return msg.decode(self.ID_port_properties[ID]["encoding"])
 
+    def query(self, cmd: str, ID: str) -> str:  # noqa: N803
+        """Send a command to the instrument with the given GPIB address and return its answer.
+
+        Args:
+            cmd: The command to send.
+            ID: The GPIB address of the instrument.
+
+        Returns:
+            The answer of the instrument.
+        """
+        self.write(cmd, ID)
+        answer: str = self.read(ID)
+        return answer
+
     def set_controller_in_charge(self):
         self.write("++ifc")
 
+    def _send_setting(self, setting: str, value: object) -> None:
+        """Send a setting to the controller, unless the controller already uses this value.
+
+        Args:
+            setting: The name of the setting, e.g. 'mode' for '++mode'.
+            value: The new value of the setting.
+        """
+        value_str = str(value)
+        if self._settings.get(setting) != value_str:
+            self.write(f"++{setting} {value_str}")
+            self._settings[setting] = value_str
+
     def set_mode(self, mode):
-        self.write("++mode %s" % str(mode))
+        self._send_setting("mode", mode)
 
     def get_mode(self):
         self.write("++mode")
         return self.port.readline().rstrip().decode()
 
     def set_eos(self, eos):
-        self.write("++eos %s" % str(eos))  # EOS terminator - 0:CR+LF, 1:CR, 2:LF, 3:None
+        self._send_setting("eos", eos)  # EOS terminator - 0:CR+LF, 1:CR, 2:LF, 3:None
 
     def get_eos(self):
         self.write("++eos")
         return self.port.readline().rstrip().decode()
 
     def set_eoi(self, eoi):
-        self.write("++eoi %s" % str(eoi))  # 0 = no eoi at end, 1 = eoi at end
+        self._send_setting("eoi", eoi)  # 0 = no eoi at end, 1 = eoi at end
 
     def get_eoi(self):
         self.write("++eoi")
         return self.port.readline().rstrip().decode()
 
     def set_auto(self, auto):
-        self.write("++auto %s" % str(auto))  # 0 not read-after-write, 1 = read-after-write
+        self._send_setting("auto", auto)  # 0 not read-after-write, 1 = read-after-write
 
     def get_auto(self):
         self.write("++auto")
@@ -1375,7 +1584,7 @@ class PrologixGPIBcontroller:
         """ set the read timeout in s """
 
         # conversion from s to ms, maximum is 3000, minimum is 1
-        self.write("++read_tmo_ms %i" % int(max(1, min(3000, float(readtimeout) * 1000))))
+        self._send_setting("read_tmo_ms", int(max(1, min(3000, float(readtimeout) * 1000))))
 
     def get_readtimeout(self):
         self.write("++read_tmo_ms")
@@ -1411,8 +1620,43 @@ def get_prologix_controllers():
 prologix_controller: dict[str, PrologixGPIBcontroller] = {}
 # add_prologix_controller("COM23")
 
+# in s, how long the result of a VISA resource query is reused before VISA is queried again
+VISA_RESOURCES_CACHE_DURATION = 5.0
+# only the interfaces of the VISA port types are searched, but e.g. no VXI or FireWire instruments
+VISA_RESOURCES_QUERY = "(GPIB|PXI|ASRL|USB|TCPIP)?*"
+
+
+@dataclass
+class _VisaResourcesCache:
+    """Resource names found by the last VISA query and the time of that query, None if not queried yet."""
+
+    resources: tuple[str, ...] = ()
+    time: float | None = None
+
+
+_visa_resources_cache = _VisaResourcesCache()
+_visa_resources_lock = threading.Lock()
+
+# "last_working" is the visa dll path from which the last resource manager was created
+_visa_paths: dict[str, str] = {}
+
 rm = open_resourcemanager()
 
+# maps the port ID prefix to the name of the port type, as used in error messages, and the port class
+port_classes: dict[str, tuple[str, type[Port]]] = {
+    "GPIB": ("GPIB", GPIBport),
+    "PXI": ("PXI", PXIport),
+    "ASRL": ("ASRL", ASRLport),
+    "TCPIP": ("TCPIP", TCPIPport),
+    "COM": ("COM", COMport),
+    "SOCKET": ("Socket", SOCKETport),
+    "USB": ("USBTMC", USBTMCport),
+    "USBTMC": ("USBTMC", USBTMCport),
+}
+
+# prefixes sorted by length, so that the longest prefix matching the beginning of a port ID is found first
+_prefix_tuple = tuple(sorted(port_classes, key=len, reverse=True))
+
 port_types = {
     "COM": COM(),
     # "MODBUS": MODBUS(),
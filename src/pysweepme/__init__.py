@@ -46,13 +46,13 @@ if sys.platform == "win32":
 
 from .FolderManager import addFolderToPATH, get_path, set_path
 from .EmptyDeviceClass import EmptyDevice
-from .DeviceManager import get_device, get_driver
+from .DeviceManager import get_device, get_driver, get_driver_class, get_driver_instance
 from .Ports import get_port, close_port
 from .ErrorMessage import error, debug
 
 __all__ = ["FolderManager", "addFolderToPATH", "get_path", "set_path",
            "EmptyDeviceClass", "EmptyDevice",
-           "DeviceManager", "get_device", "get_driver",
+           "DeviceManager", "get_device", "get_driver", "get_driver_class", "get_driver_instance",
            "Ports", "get_port", "close_port",
            "PortManager", "Config",
            "ErrorMessage","error", "debug",
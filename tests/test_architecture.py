@@ -0,0 +1,18 @@
+"""Test functions of the Architecture module."""
+
+import sys
+
+from pysweepme.Architecture import VersionInfo
+
+
+class TestVersionInfo:
+    """Tests for the information about the python interpreter."""
+
+    def test_python_suffix(self) -> None:
+        """Test that the suffix consists of the python version and the bitness."""
+        version_info = VersionInfo()
+        version = sys.version_info
+        assert version_info.python_version_str == f"{version.major}.{version.minor}"
+        assert version_info.python_suffix == f"{version.major}{version.minor}_{version_info.python_bitness_str}"
+        assert version_info.python_bitness_str in ("32", "64")
+        assert f"{version_info.python_version_str}-any" in version_info.python_compatibility_flags
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import cast
+from unittest.mock import patch
+
+import pytest
 
 from pysweepme.Config import Config, DefaultFileIO
 from pysweepme.pysweepme_types import FileIOProtocol
@@ -44,3 +47,124 @@ class TestDefaultFileIO:
         DefaultFileIO.register_custom_default(get_mypath)
         config = Config(".")
         assert config.reader_writer is my_path
+
+
+class TestConfig:
+    """Tests for reading config files."""
+
+    def test_get_values_reads_file_once(self, tmp_path: Path) -> None:
+        """Test that the file is only read again if it has been changed."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[A]\nkey = 1\nKey2 = %%\n\n[B]\nkey = 2\n", encoding="utf-8")
+        config = Config(file)
+        with patch.object(config, "read_string", wraps=config.read_string) as mocked_read_string:
+            assert config.get_values() == {"A": {"key": "1", "Key2": "%"}, "B": {"key": "2"}}
+            assert config.get_values() == {section: config.get_options(section) for section in config.get_sections()}
+            assert mocked_read_string.call_count == 1
+
+            file.write_text("[A]\nkey = 30\nKey2 = %%\n\n[B]\nkey = 2\n", encoding="utf-8")
+            assert config.get_value("A", "key") == "30"
+            assert mocked_read_string.call_count == 2  # noqa: PLR2004
+
+    def test_parsed_contents_shared_between_instances(self, tmp_path: Path) -> None:
+        """Test that a new instance reuses the parsed contents of an unchanged file, also after writing it."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[DEFAULT]\ndefault = 0\n\n[A]\nkey = 1\n", encoding="utf-8")
+        assert Config(file).get_values() == {"A": {"default": "0", "key": "1"}}
+
+        config = Config(file)
+        with patch.object(config, "read_string", wraps=config.read_string) as mocked_read_string:
+            assert config.get_values() == {"A": {"default": "0", "key": "1"}}
+            assert config.set_option("B", "key", "2")
+            assert config.get_value("B", "key") == "2"
+            assert mocked_read_string.call_count == 0
+
+        config = Config(file)
+        with patch.object(config, "read_string", wraps=config.read_string) as mocked_read_string:
+            assert config.get_values() == {"A": {"default": "0", "key": "1"}, "B": {"default": "0", "key": "2"}}
+            assert mocked_read_string.call_count == 0
+
+    def test_parsed_contents_not_checked_again(self, tmp_path: Path) -> None:
+        """Test that a value with a single '%' can be loaded again from the shared parsed contents."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[A]\nkey = 50%\n", encoding="utf-8")
+        for _ in range(2):
+            config = Config(file)
+            assert config.load_file()
+            assert config.get("A", "key", raw=True) == "50%"
+
+    def test_set_option_writes_once(self, tmp_path: Path) -> None:
+        """Test that setting an option of a new section writes the file only once."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[A]\nkey = 1\n", encoding="utf-8")
+        config = Config(file)
+        with patch.object(config, "write", wraps=config.write) as mocked_write:
+            assert config.set_option("B", "key", "2")
+            assert mocked_write.call_count == 1
+        assert Config(file).get_values() == {"A": {"key": "1"}, "B": {"key": "2"}}
+
+    def test_get_value_prefers_lower_case_key(self) -> None:
+        """Test that the lower case key is preferred and the original key is used otherwise."""
+        config = Config("[A]\nkey = 1\nKey = 2\nKey2 = 3\n")
+        assert config.get_value("A", "KEY") == "1"
+        assert config.get_value("A", "Key2") == "3"
+        assert config.get_value("A", "KEY2") is False
+        assert config.get_value("B", "key") is False
+
+    def test_failed_write_keeps_file(self, tmp_path: Path) -> None:
+        """Test that the config file is not changed and no temporary file remains if writing fails."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[A]\nkey = 1\n", encoding="utf-8")
+        with patch("pathlib.Path.replace", side_effect=OSError("disk full")):
+            assert not Config(file).set_option("A", "key", "2")
+        assert file.read_text(encoding="utf-8") == "[A]\nkey = 1\n"
+        assert list(tmp_path.iterdir()) == [file]
+
+        assert Config(file).set_option("A", "key", "2")
+        assert Config(file).get_value("A", "key") == "2"
+        assert list(tmp_path.iterdir()) == [file]
+
+    def test_contents_read_once(self) -> None:
+        """Test that the deprecated contents of an ini file are only parsed once."""
+        config = Config("[A]\nkey = 1\n")
+        with patch.object(config, "read_string", wraps=config.read_string) as mocked_read_string:
+            assert config.get_value("A", "key") == "1"
+            assert config.get_options("A") == {"key": "1"}
+            assert mocked_read_string.call_count == 1
+
+    def test_bulk_load(self, tmp_path: Path) -> None:
+        """Test that several config files are loaded and returned in the given order."""
+        DefaultFileIO.custom_default_file_io = None
+        files = [tmp_path / f"config{index}.ini" for index in range(5)]
+        for index, file in enumerate(files):
+            file.write_text(f"[A]\nkey = {index}\n", encoding="utf-8")
+        configs = Config.bulk_load(files)
+        assert [config.file_name for config in configs] == files
+        assert [config["A"]["key"] for config in configs] == ["0", "1", "2", "3", "4"]
+        assert Config.bulk_load([]) == []
+
+    def test_keyboard_interrupt_not_caught(self, tmp_path: Path) -> None:
+        """Test that errors are reported as return value, but a KeyboardInterrupt is not caught."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "config.ini"
+        file.write_text("[A]\nkey = 1\n", encoding="utf-8")
+        config = Config(file)
+        with patch.object(config, "read_string", side_effect=ValueError("invalid")):
+            assert not config.load_file()
+        with patch.object(config, "read_string", side_effect=KeyboardInterrupt), pytest.raises(KeyboardInterrupt):
+            config.load_file()
+
+    def test_create_file(self, tmp_path: Path) -> None:
+        """Test that a config file is created together with its folders."""
+        DefaultFileIO.custom_default_file_io = None
+        file = tmp_path / "folder" / "subfolder" / "config.ini"
+        config = Config(file)
+        assert not config.is_file()
+        assert config.create_file()
+        assert config.is_file()
+        assert not Config(tmp_path).is_file()
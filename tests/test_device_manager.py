@@ -1,10 +1,20 @@
 """Test pysweepme DeviceManager functions."""
 
+import os
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from pysweepme.DeviceManager import get_driver, get_driver_instance, get_main_py_path
+import pytest
+
+from pysweepme.DeviceManager import (
+    clear_driver_cache,
+    get_driver,
+    get_driver_instance,
+    get_driver_module,
+    get_main_py_path,
+    load_source,
+)
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 BITNESS_DISCRIMINATOR = 0x100000000
@@ -47,7 +57,7 @@ class TestDeviceManager:
         class LoadSource:
             Device = CustomDevice
 
-        with patch("DeviceManager.imp.load_source") as mocked_load_soure, patch(
+        with patch("DeviceManager.load_source") as mocked_load_soure, patch(
             "DeviceManager.get_main_py_path",
         ) as mocked_get_main_py_path:
             mocked_load_soure.return_value = LoadSource
@@ -78,3 +88,49 @@ class TestDeviceManager:
 
         run_test("C:\\my_dc_dir", "C:\\my_dc_dir", "")
         run_test(".", ".", "COM007")
+
+    def test_load_source(self, tmp_path: Path) -> None:
+        """Test that a python file is loaded as module and registered in sys.modules."""
+        main_file = tmp_path / "main.py"
+        main_file.write_text("class Device:\n    value = 1\n", encoding="utf-8")
+        try:
+            module = load_source("pysweepme_test_driver", str(main_file))
+            assert module.Device.value == 1
+            assert sys.modules["pysweepme_test_driver"] is module
+        finally:
+            sys.modules.pop("pysweepme_test_driver", None)
+
+        main_file.write_text("raise ValueError\n", encoding="utf-8")
+        with pytest.raises(ValueError):  # noqa: PT011
+            load_source("pysweepme_test_driver", str(main_file))
+        assert "pysweepme_test_driver" not in sys.modules
+
+    def test_get_driver_module_cached(self, tmp_path: Path) -> None:
+        """Test that a driver module is only loaded again if its main file has been modified."""
+        main_file = tmp_path / "pysweepme_test_driver" / "main.py"
+        main_file.parent.mkdir()
+        main_file.write_text("class Device:\n    value = 1\n", encoding="utf-8")
+        clear_driver_cache()
+        try:
+            module = get_driver_module(str(tmp_path), "pysweepme_test_driver")
+            assert get_driver_module(str(tmp_path), "pysweepme_test_driver") is module
+
+            main_file.write_text("class Device:\n    value = 2\n", encoding="utf-8")
+            modification_time = main_file.stat().st_mtime_ns + 1_000_000_000
+            os.utime(main_file, ns=(modification_time, modification_time))
+            module = get_driver_module(str(tmp_path), "pysweepme_test_driver")
+            assert module.Device.value == 2  # noqa: PLR2004
+
+            clear_driver_cache()
+            assert get_driver_module(str(tmp_path), "pysweepme_test_driver") is not module
+        finally:
+            clear_driver_cache()
+            sys.modules.pop("pysweepme_test_driver", None)
+
+    def test_get_driver_reuse(self) -> None:
+        """Test that an existing driver instance is only returned if reuse is requested."""
+        with patch("DeviceManager.get_driver_instance", side_effect=lambda *_: MagicMock()):
+            device = get_driver("my_device", "C:\\my_dc_dir")
+            assert get_driver("my_device", "C:\\my_dc_dir", reuse=True) is device
+            assert get_driver("my_device", "C:\\my_dc_dir") is not device
+            assert get_driver("my_device", "C:\\other_dir", reuse=True) is not device
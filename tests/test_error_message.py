@@ -0,0 +1,56 @@
+"""Test functions of the ErrorMessage module."""
+
+import pytest
+
+from pysweepme.ErrorMessage import debug, debug_only, error
+
+
+class TestDebug:
+    """Tests for the debug and debug_only functions."""
+
+    def test_debug(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that debug messages are printed with all arguments."""
+        debug("my message", 42)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "-" * 60
+        assert lines[1].startswith("Debug: ")
+        assert lines[1].endswith("\t my message 42")
+
+    def test_debug_without_arguments(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that nothing is printed if there is no message."""
+        debug()
+        assert capsys.readouterr().out == ""
+
+    def test_debug_only(self, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that debug_only messages are only printed when the debug mode is on."""
+        monkeypatch.delenv("SWEEPME_DEBUGMODE", raising=False)
+        debug_only("hidden")
+        assert capsys.readouterr().out == ""
+
+        monkeypatch.setenv("SWEEPME_DEBUGMODE", "False")
+        debug_only("hidden")
+        assert capsys.readouterr().out == ""
+
+        monkeypatch.setenv("SWEEPME_DEBUGMODE", "True")
+        debug_only("shown")
+        assert capsys.readouterr().out.endswith("\t shown\n")
+
+
+class TestError:
+    """Tests for the error function."""
+
+    def test_error(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that the message and the traceback of the current exception are printed."""
+        msg = "my error"
+        try:
+            raise ValueError(msg)  # noqa: TRY301
+        except ValueError:
+            error("my message", 42)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "-" * 60
+        assert lines[1].startswith("Time: ")
+        assert lines[2] == "Message: my message 42"
+        assert lines[3] == "Python Error:"
+        assert lines[4] == "Traceback (most recent call last):"
+        assert lines[-2] == "ValueError: my error"
+        assert lines[-1] == "-" * 60
@@ -0,0 +1,437 @@
+"""Test functions of the Ports module."""
+
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+import pyvisa
+import serial
+
+from pysweepme import Ports
+
+
+class TestListVisaResources:
+    """Tests for finding VISA resources of the different port types."""
+
+    resources = ("GPIB0::1::INSTR", "GPIB0::INTFC", "USB0::0x1234::0x5678::SN1::INSTR", "TCPIP0::1.2.3.4::INSTR")
+
+    def setup_method(self) -> None:
+        """Make sure that no resources of previous tests are cached."""
+        Ports.clear_visa_resources_cache()
+
+    def teardown_method(self) -> None:
+        """Make sure that no resources of the test are cached."""
+        Ports.clear_visa_resources_cache()
+
+    def test_filter_by_port_type(self) -> None:
+        """Test that each port type only finds its own resources, and VISA is only queried once."""
+        resource_manager = MagicMock()
+        resource_manager.list_resources.return_value = self.resources
+        with patch("pysweepme.Ports.rm", resource_manager, create=True), patch(
+            "pysweepme.Ports.get_resourcemanager",
+            return_value=resource_manager,
+        ):
+            assert Ports.get_resources(["GPIB", "USBTMC", "TCPIP", "PXI"]) == [
+                "GPIB0::1::INSTR",
+                "USB0::0x1234::0x5678::SN1::INSTR",
+                "TCPIP0::1.2.3.4::INSTR",
+            ]
+            assert resource_manager.list_resources.call_count == 1
+            assert resource_manager.list_resources.call_args.args == ("(GPIB|PXI|ASRL|USB|TCPIP)?*",)
+
+            Ports.clear_visa_resources_cache()
+            assert Ports.list_visa_resources("GPIB") == ["GPIB0::1::INSTR", "GPIB0::INTFC"]
+            assert resource_manager.list_resources.call_count == 2  # noqa: PLR2004
+
+    def test_get_resources_order(self) -> None:
+        """Test that the resources of all port types are returned in the order of the given port types."""
+        with patch.object(Ports.COM, "find_resources", return_value=["COM1", "COM2"]), patch.object(
+            Ports.SOCKET,
+            "find_resources",
+            return_value=["127.0.0.1:5025"],
+        ):
+            assert Ports.get_resources(["SOCKET", "COM"]) == ["127.0.0.1:5025", "COM1", "COM2"]
+            assert Ports.get_resources([]) == []
+
+    def test_query_independent_of_clock_origin(self) -> None:
+        """Test that VISA is queried if nothing is cached, even directly at the reference point of the clock."""
+        resource_manager = MagicMock()
+        resource_manager.list_resources.return_value = self.resources
+        with patch("pysweepme.Ports.rm", resource_manager, create=True), patch(
+            "pysweepme.Ports.get_resourcemanager",
+            return_value=resource_manager,
+        ), patch("time.perf_counter", return_value=0.0):
+            assert Ports.list_visa_resources("TCPIP") == ["TCPIP0::1.2.3.4::INSTR"]
+            assert Ports.list_visa_resources("TCPIP") == ["TCPIP0::1.2.3.4::INSTR"]
+            assert resource_manager.list_resources.call_count == 1
+
+            Ports.clear_visa_resources_cache()
+            assert Ports.list_visa_resources("TCPIP") == ["TCPIP0::1.2.3.4::INSTR"]
+            assert resource_manager.list_resources.call_count == 2  # noqa: PLR2004
+
+    def test_without_resource_manager(self) -> None:
+        """Test that no resources are found if there is no VISA runtime."""
+        with patch("pysweepme.Ports.get_resourcemanager", return_value=False):
+            assert Ports.list_visa_resources("GPIB") == []
+
+
+class TestListComPorts:
+    """Tests for finding COM ports."""
+
+    def test_list_ports_fallback(self) -> None:
+        """Test that pyserial is used to find COM ports if the registry is not available."""
+        port = MagicMock()
+        port.device = "COM3"
+        with patch("pysweepme.Ports.sys.platform", "linux"), patch(
+            "serial.tools.list_ports.comports",
+            return_value=[port],
+        ):
+            assert Ports.list_com_ports() == ["COM3"]
+
+
+class TestWriteDelay:
+    """Tests for the delay between two writes."""
+
+    def test_respect_delay(self) -> None:
+        """Test that only the remaining delay is slept at once."""
+        port = Ports.GPIBport("GPIB0::1::INSTR")
+        port.port_properties["delay"] = 0.5
+        with patch("pysweepme.Ports.time.perf_counter", return_value=100.0), patch(
+            "pysweepme.Ports.time.sleep",
+        ) as mocked_sleep:
+            port.actualwritetime = 99.8
+            port._respect_delay()
+            assert mocked_sleep.call_count == 1
+            assert mocked_sleep.call_args.args[0] == pytest.approx(0.3)
+
+            port.actualwritetime = 99.0
+            port._respect_delay()
+            assert mocked_sleep.call_count == 1
+
+
+class TestWriteMany:
+    """Tests for writing several commands at once."""
+
+    def test_fallback(self) -> None:
+        """Test that commands are written one by one if the port does not support writing them at once."""
+        port = Ports.GPIBport("GPIB0::1::INSTR")
+        with patch.object(port, "write_internal") as mocked_write_internal:
+            port.write_many(["*RST", "", "*CLS"])
+            assert [call.args for call in mocked_write_internal.call_args_list] == [("*RST",), ("*CLS",)]
+
+    def test_socket(self) -> None:
+        """Test that a socket port sends all commands with a single call."""
+        socket = MagicMock()
+        port = Ports.SOCKETport("127.0.0.1:5025")
+        port.port = socket
+        port.write_termination = "\n"
+        port.last_writetime = 0.0
+        port.write_many(["*RST", "*CLS"])
+        assert socket.sendall.call_count == 1
+        assert socket.sendall.call_args.args == (b"*RST\n*CLS\n",)
+
+
+class TestCOMport:
+    """Tests for the COM port."""
+
+    def setup_method(self) -> None:
+        """Create a COM port with a mocked serial port."""
+        self.serial_port = MagicMock()
+        self.port = Ports.COMport("COM1")
+        self.port.port = self.serial_port
+
+    def test_write(self) -> None:
+        """Test that commands are encoded and followed by the terminator."""
+        self.port.port_properties["EOLwrite"] = "\r\n"
+        self.port.write("*IDN?")
+        self.port.write(b"\x01\x02")
+        self.port.write_raw(b"\x03")
+        assert [call.args for call in self.serial_port.write.call_args_list] == [
+            (b"*IDN?\r\n",),
+            (b"\x01\x02\r\n",),
+            (b"\x03\r\n",),
+        ]
+
+    def test_readline(self) -> None:
+        """Test that a line is read until the terminator and returned without it."""
+        self.port.port_properties["EOLread"] = "\r\n"
+        self.serial_port.in_waiting = 0
+        self.serial_port.read.side_effect = [b"1", b"\r", b"2", b"\r", b"\n", b"3"]
+        assert self.port.readline() == (b"1\r2", True)
+        assert self.serial_port.unread.call_args.args == (b"",)
+
+    def test_readline_waiting_bytes(self) -> None:
+        """Test that waiting bytes are read at once and bytes after the terminator are kept for the next reading."""
+        self.port.port = Ports.BufferedSerial()
+        self.port.port_properties["EOLread"] = "\n"
+        with patch.object(serial.Serial, "in_waiting", new_callable=PropertyMock) as mocked_in_waiting, patch.object(
+            serial.Serial,
+            "read",
+            side_effect=[b"1\n2\n34", b"5"],
+        ) as mocked_read:
+            mocked_in_waiting.side_effect = [6, 0, 0, 0]
+            assert self.port.readline() == (b"1", True)
+            assert self.port.readline() == (b"2", True)
+            assert self.port.in_waiting() == 2  # noqa: PLR2004
+            assert self.port.read_raw(3) == b"345"
+            assert [call.args for call in mocked_read.call_args_list] == [(6,), (1,)]
+
+    def test_buffered_bytes_direct_access(self) -> None:
+        """Test that bytes after the terminator are also seen by drivers that use the serial port directly."""
+        self.port.port = Ports.BufferedSerial()
+        self.port.port_properties["EOLread"] = "\n"
+        with patch.object(serial.Serial, "in_waiting", new_callable=PropertyMock) as mocked_in_waiting, patch.object(
+            serial.Serial,
+            "read",
+            return_value=b"1\n234",
+        ), patch.object(serial.Serial, "reset_input_buffer") as mocked_reset_input_buffer:
+            mocked_in_waiting.return_value = 6
+            assert self.port.readline() == (b"1", True)
+            mocked_in_waiting.return_value = 0
+            assert self.port.port.in_waiting == 3  # noqa: PLR2004
+            assert self.port.port.read(2) == b"23"
+            self.port.port.reset_input_buffer()
+            assert self.port.port.in_waiting == 0
+            assert mocked_reset_input_buffer.call_count == 1
+
+    def test_read_undecodable(self) -> None:
+        """Test that a reading that cannot be decoded is reported and raises."""
+        self.port.port_properties["encoding"] = "utf-8"
+        self.serial_port.read.return_value = b"\xff"
+        with patch("pysweepme.Ports.error") as mocked_error, pytest.raises(UnicodeDecodeError):
+            self.port.read(1)
+        assert "COM1" in mocked_error.call_args.args[0]
+
+    def test_readline_timeout(self) -> None:
+        """Test that the bytes received until the timeout are returned completely."""
+        self.port.port_properties["EOLread"] = "\n"
+        self.serial_port.in_waiting = 0
+        self.serial_port.read.side_effect = [b"1", b"2", b""]
+        assert self.port.readline() == (b"12", False)
+
+    def test_write_many(self) -> None:
+        """Test that several commands are sent with a single call."""
+        self.port.port_properties["EOLwrite"] = "\n"
+        self.port.write_many(["*RST", "", "*CLS"])
+        assert [call.args for call in self.serial_port.write.call_args_list] == [(b"*RST\n*CLS\n",)]
+
+    def test_open_already_open(self) -> None:
+        """Test that an already open serial port is not reopened, but gets the new settings."""
+        self.serial_port.port = "COM1"
+        self.serial_port.is_open = True
+        self.port.port_properties["baudrate"] = 115200
+        self.port.open()
+        assert self.serial_port.baudrate == 115200  # noqa: PLR2004
+        assert self.serial_port.open.call_count == 0
+        assert self.serial_port.close.call_count == 0
+
+    def test_clear(self) -> None:
+        """Test that both buffers are reset when clearing the port."""
+        with patch("pysweepme.Ports.sys.platform", "linux"):
+            self.port.clear()
+        assert self.serial_port.reset_input_buffer.call_count == 1
+        assert self.serial_port.reset_output_buffer.call_count == 1
+
+    @pytest.mark.parametrize(("purged", "reset_count"), [(1, 0), (0, 1)])
+    def test_clear_windows(self, purged: int, reset_count: int) -> None:
+        """Test that both buffers are purged at once on Windows and reset as usual if purging fails."""
+        win32 = MagicMock()
+        win32.PurgeComm.return_value = purged
+        self.serial_port.is_open = True
+        with patch("pysweepme.Ports.sys.platform", "win32"), patch.dict("sys.modules", {"serial.win32": win32}):
+            self.port.clear()
+        assert win32.PurgeComm.call_count == 1
+        assert self.serial_port.reset_input_buffer.call_count == reset_count
+        assert self.serial_port.reset_output_buffer.call_count == reset_count
+
+
+class TestGetPort:
+    """Tests for creating port objects from their ID."""
+
+    @pytest.mark.parametrize(
+        ("port_id", "port_class"),
+        [
+            ("GPIB0::1::INSTR", Ports.GPIBport),
+            ("COM3", Ports.COMport),
+            ("USB0::0x1234::0x5678::SN1::INSTR", Ports.USBTMCport),
+            ("USBTMC0::0x1234::0x5678::SN1::INSTR", Ports.USBTMCport),
+            ("TCPIP0::1.2.3.4::INSTR", Ports.TCPIPport),
+            ("ASRL3::INSTR", Ports.ASRLport),
+            ("ASRLCOM3::INSTR", Ports.ASRLport),
+        ],
+    )
+    def test_port_class(self, port_id: str, port_class: type[Ports.Port]) -> None:
+        """Test that the port class is chosen by the longest known prefix of the ID."""
+        # ASRL is not a port type of its own yet, so its port properties cannot be initialized
+        with patch.object(port_class, "initialize_port_properties"), patch.object(port_class, "open"), patch.object(
+            port_class,
+            "clear",
+        ):
+            port = Ports.get_port(port_id, {"open": False, "clear": False})
+        assert type(port) is port_class
+
+    def test_initialize_port_properties_once(self) -> None:
+        """Test that the port properties are initialized only once when creating a port."""
+        with patch.object(Ports.COMport, "initialize_port_properties") as mocked_initialize, patch.object(
+            Ports.COMport,
+            "open",
+        ), patch.object(Ports.COMport, "clear"):
+            Ports.get_port("COM3", {"open": False, "clear": False})
+        assert mocked_initialize.call_count == 1
+
+    def test_unknown_port_type(self) -> None:
+        """Test that no port object is created for an unknown port type."""
+        with patch("pysweepme.Ports.error"):
+            assert Ports.get_port("UNKNOWN0::1") is False
+
+    @pytest.mark.parametrize(
+        ("port_id", "port_class", "port_type_name"),
+        [
+            ("COM3", Ports.COMport, "COM"),
+            ("USB0::0x1234::0x5678::SN1::INSTR", Ports.USBTMCport, "USBTMC"),
+            ("192.168.0.1:5025", Ports.SOCKETport, "Socket"),
+        ],
+    )
+    def test_port_creation_fails(self, port_id: str, port_class: type[Ports.Port], port_type_name: str) -> None:
+        """Test that a failing port creation is reported with the name of the port type."""
+        with patch.object(port_class, "__init__", side_effect=OSError), patch("pysweepme.Ports.error") as mocked_error:
+            assert Ports.get_port(port_id) is False
+        mocked_error.assert_called_once_with(f"Ports: Cannot create {port_type_name} port object for {port_id}")
+
+
+class TestOpenResourcemanager:
+    """Tests for creating the VISA resource manager."""
+
+    def test_get_without_resource_manager(self) -> None:
+        """Test that no resource manager is returned if it could not be created."""
+        with patch("pysweepme.Ports.rm", None, create=True):
+            assert Ports.get_resourcemanager() is False
+
+    def test_reopen_closed_resource_manager(self) -> None:
+        """Test that a closed resource manager is replaced by a new one."""
+        closed_resource_manager = MagicMock()
+        type(closed_resource_manager).session = PropertyMock(side_effect=pyvisa.errors.InvalidSession())
+        new_resource_manager = MagicMock()
+        with patch("pysweepme.Ports.rm", closed_resource_manager, create=True), patch(
+            "pysweepme.Ports.open_resourcemanager",
+            return_value=new_resource_manager,
+        ):
+            assert Ports.get_resourcemanager() is new_resource_manager
+
+        with patch("pysweepme.Ports.rm", closed_resource_manager, create=True), patch(
+            "pysweepme.Ports.open_resourcemanager",
+            return_value=None,
+        ):
+            assert Ports.get_resourcemanager() is False
+
+    def test_remember_working_visa_path(self) -> None:
+        """Test that the visa dll path that worked before is tried first."""
+        working_path = "C:\\Windows\\System32\\visa32.dll"
+
+        def resource_manager(visa_path: str) -> MagicMock:
+            if visa_path != working_path:
+                msg = "no visa dll"
+                raise OSError(msg)
+            return MagicMock()
+
+        with patch.dict("pysweepme.Ports._visa_paths", clear=True), patch(
+            "pyvisa.ResourceManager",
+            side_effect=resource_manager,
+        ) as mocked_resource_manager:
+            Ports.open_resourcemanager()
+            assert [call.args for call in mocked_resource_manager.call_args_list] == [("",), (working_path,)]
+
+            mocked_resource_manager.reset_mock()
+            Ports.open_resourcemanager()
+            assert [call.args for call in mocked_resource_manager.call_args_list] == [(working_path,)]
+
+
+class TestGPIBport:
+    """Tests for the GPIB port."""
+
+    def test_prologix(self) -> None:
+        """Test that commands to a Prologix controller are sent to the GPIB address of the port."""
+        controller = MagicMock()
+        port = Ports.GPIBport("GPIB::3::Prologix@COM3")
+        port.port = controller
+        port.write("*IDN?")
+        port.read()
+        assert controller.write.call_args.args == ("*IDN?", "3")
+        assert controller.read.call_args.args == ("3",)
+        assert port.prologix_com_port == "COM3"
+
+    def test_visa(self) -> None:
+        """Test that commands to a VISA GPIB port are sent without address."""
+        instrument = MagicMock()
+        port = Ports.GPIBport("GPIB0::1::INSTR")
+        port.port = instrument
+        port.write("*IDN?")
+        port.read()
+        assert instrument.write.call_args.args == ("*IDN?",)
+        assert instrument.read.call_args.args == ()
+        assert port.prologix_com_port is None
+
+
+class TestPrologixGPIBcontroller:
+    """Tests for the Prologix GPIB controller."""
+
+    def setup_method(self) -> None:
+        """Create a controller with a mocked serial port."""
+        self.serial_port = MagicMock()
+        self.controller = Ports.PrologixGPIBcontroller("COM3")
+        self.controller.port = self.serial_port
+        self.controller.ID_port_properties["3"] = {
+            "timeout": 1,
+            "rstrip": True,
+            "encoding": "latin-1",
+            "Prologix_auto_read": False,
+        }
+
+    def test_read(self) -> None:
+        """Test that the answer is requested until a complete line is received."""
+        self.serial_port.readline.side_effect = [b"", b"1.2", b"3\n"]
+        assert self.controller.read("3") == "1.23"
+        assert [call.args for call in self.serial_port.write.call_args_list] == [(b"++read eoi\n",)] * 3
+
+    def test_write_escaped(self) -> None:
+        """Test that special characters of a command are escaped and the GPIB address is set beforehand."""
+        self.controller.write("VOLT +1.0E+00\x1b\r", "3")
+        assert [call.args for call in self.serial_port.write.call_args_list] == [
+            (b"++addr 3\n",),
+            (b"++auto 0\n",),
+            (b"VOLT \x1b+1.0E\x1b+00\x1b\x1b\x1b\r\n",),
+        ]
+
+    def test_auto_read(self) -> None:
+        """Test that the answer is not requested separately if the controller reads after each command."""
+        self.controller.ID_port_properties["3"]["Prologix_auto_read"] = True
+        self.serial_port.readline.return_value = b"1.23\n"
+        assert self.controller.query("MEAS?", "3") == "1.23"
+        assert [call.args for call in self.serial_port.write.call_args_list] == [
+            (b"++addr 3\n",),
+            (b"++auto 1\n",),
+            (b"MEAS?\n",),
+        ]
+
+    def test_auto_read_delayed_answer(self) -> None:
+        """Test that the answer is requested if a slow instrument did not answer within the controller timeout."""
+        self.controller.ID_port_properties["3"]["Prologix_auto_read"] = True
+        self.serial_port.readline.side_effect = [b"", b"1.23\n"]
+        assert self.controller.query("MEAS?", "3") == "1.23"
+        assert [call.args for call in self.serial_port.write.call_args_list] == [
+            (b"++addr 3\n",),
+            (b"++auto 1\n",),
+            (b"MEAS?\n",),
+            (b"++read eoi\n",),
+        ]
+
+    def test_settings_sent_once(self) -> None:
+        """Test that settings are only sent to the controller if they change."""
+        self.controller.set_mode(1)
+        self.controller.set_mode(1)
+        self.controller.set_eos(2)
+        self.controller.set_mode(0)
+        assert [call.args for call in self.serial_port.write.call_args_list] == [
+            (b"++mode 1\n",),
+            (b"++eos 2\n",),
+            (b"++mode 0\n",),
+        ]